@@ -1,24 +1,57 @@
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use("Agg")
-
-def generate_histogram(df, output_path):
-    plt.figure()
-    plt.hist(df["value"], bins=10)
-    plt.xlabel("Value")
-    plt.ylabel("Count")
-    plt.title("Measurement Distribution")
-    plt.savefig(output_path)
-    plt.close()
-
-
-def generate_scatter(df, output_path):
-    plt.figure()
-    plt.scatter(df["sample_id"], df["value"])
-    plt.axhline(df["lower_limit"].iloc[0], linestyle="--")
-    plt.axhline(df["upper_limit"].iloc[0], linestyle="--")
-    plt.xticks(rotation=45)
-    plt.title("Value vs Sample ID")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+import io
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Each thread keeps one Figure/Axes, cleared between renders, so concurrent
+# report builds never share one. Figures are built directly on an Agg canvas rather
+# than through pyplot, so there is no global figure state to share or leak.
+_local = threading.local()
+
+
+def _get_axes():
+    if not hasattr(_local, "fig"):
+        # Sized to the 170x85 mm slot in the PDF so no tight_layout pass is needed.
+        fig = Figure(figsize=(6.7, 3.35), dpi=90)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        fig.subplots_adjust(left=0.1, right=0.98, bottom=0.25, top=0.92)
+        _local.fig, _local.ax = fig, ax
+    _local.ax.clear()
+    return _local.fig, _local.ax
+
+
+def _render_png(fig):
+    buf = io.BytesIO()
+    fig.canvas.print_png(buf)
+    buf.seek(0)
+    return buf
+
+
+def generate_histogram(df):
+    fig, ax = _get_axes()
+    values = df["value"].to_numpy()
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=10)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+    ax.tick_params(axis="x", labelrotation=0)  # clear() keeps tick params
+    ax.set_xlabel("Value")
+    ax.set_ylabel("Count")
+    ax.set_title("Measurement Distribution")
+    return _render_png(fig)
+
+
+def generate_scatter(df):
+    fig, ax = _get_axes()
+    # A marker-only Line2D is one path, much cheaper than a PathCollection.
+    # Points sit at row positions and only ~20 sample ids are labelled.
+    x = np.arange(len(df))
+    ax.plot(x, df["value"].to_numpy(), linestyle="none", marker="o", markersize=3)
+    ax.axhline(df["lower_limit"].iloc[0], linestyle="--")
+    ax.axhline(df["upper_limit"].iloc[0], linestyle="--")
+    ticks = x[::max(1, len(df) // 20)]
+    ax.set_xticks(ticks, labels=df["sample_id"].iloc[ticks].astype(str).tolist())
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title("Value vs Sample ID")
+    return _render_png(fig)
@@ -1,27 +1,25 @@
 from validator import validate_csv
 
 def evaluate(df):
-    df["status"] = (
-        (df["value"] >= df["lower_limit"]) &
-        (df["value"] <= df["upper_limit"])
-    )
-
-    df["status"] = df["status"].map({True: "PASS", False: "FAIL"})
-
+    v = df["value"].to_numpy()
+    lo = df["lower_limit"].to_numpy()
+    hi = df["upper_limit"].to_numpy()
+    mask = (v >= lo) & (v <= hi)
+
+    # Kept as bool; the report stringifies PASS/FAIL only where it's shown.
+    df["pass"] = mask
+
+    # One reduction over the mask; fail_count is derived, not re-scanned.
+    total = int(mask.size)
+    pass_count = int(mask.sum())
+    fail_count = total - pass_count
     summary = {
-    "total": int(len(df)),
-    "pass_count": int((df["status"] == "PASS").sum()),
-    "fail_count": int((df["status"] == "FAIL").sum()),
-}
-
-    summary["pass_rate"] = float(
-    round(summary["pass_count"] / summary["total"] * 100, 2)
-    )
-
-    summary["overall_verdict"] = (
-        "PASS" if summary["fail_count"] == 0 else "FAIL"
-    )
+        "total": total,
+        "pass_count": pass_count,
+        "fail_count": fail_count,
+        "pass_rate": float(round(pass_count / total * 100, 2)),
+        "overall_verdict": "PASS" if fail_count == 0 else "FAIL",
+    }
 
     return df, summary
 
-
@@ -1,6 +1,8 @@
-from datetime import datetime
 from pathlib import Path
+import time
 
+import numpy as np
+import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
@@ -20,6 +22,49 @@ from engine import evaluate
 from charts import generate_histogram, generate_scatter
 
 
+# Rows per detail Table; keeps ReportLab's per-table layout cost bounded.
+DETAIL_CHUNK = 250
+
+# Built once at import; getSampleStyleSheet and TableStyle are not cheap to
+# construct on every request.
+_STYLES = getSampleStyleSheet()
+
+_OVERVIEW_STYLE_BASE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.lightgrey),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FAFAFA")]),
+    ]
+)
+
+_DETAIL_STYLE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F0F0F0")),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ("FONTSIZE", (0, 1), (-1, -1), 8),
+        ("VALIGN", (0, 0), (-1,-1), "MIDDLE"),
+    ]
+)
+
+
+def _now_str() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+
+
+def _cell_strings(series) -> np.ndarray:
+    # Categorical columns: format each category once and index by code.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        labels = np.append(series.cat.categories.astype(str).to_numpy(), "")
+        return labels[series.cat.codes.to_numpy()]  # code -1 (missing) -> ""
+    return series.astype(str).to_numpy()
+
+
 def _verdict_color(verdict: str):
     return colors.green if verdict == "PASS" else colors.red
 
@@ -37,12 +82,9 @@ def build_pdf_report(
     df = validate_csv(csv_path)
     results_df, summary = evaluate(df)
 
-    # 2) Charts (saved as images)
-    output_dir = out_pdf.parent
-    hist_path = str(output_dir / "histogram.png")
-    scatter_path = str(output_dir / "scatter.png")
-    generate_histogram(results_df, hist_path)
-    generate_scatter(results_df, scatter_path)
+    # 2) Charts (rendered to in-memory PNG buffers)
+    hist_buf = generate_histogram(results_df)
+    scatter_buf = generate_scatter(results_df)
 
     # 3) PDF setup
     doc = SimpleDocTemplate(
@@ -53,9 +95,10 @@ def build_pdf_report(
         topMargin=16 * mm,
         bottomMargin=16 * mm,
         title=report_title,
+        pageCompression=1,
     )
 
-    styles = getSampleStyleSheet()
+    styles = _STYLES
     story = []
 
     # ---------- Page 1: Overview ----------
@@ -69,14 +112,15 @@ def build_pdf_report(
     story.append(Spacer(1, 8))
 
     # Overview table
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now_str = _now_str()
+    verdict = summary["overall_verdict"]
     overview_data = [
         ["Generated", now_str],
         ["Total Measurements", str(summary["total"])],
         ["Pass Count", str(summary["pass_count"])],
         ["Fail Count", str(summary["fail_count"])],
         ["Pass Rate", f'{summary["pass_rate"]:.2f}%'],
-        ["Overall Verdict", summary["overall_verdict"]],
+        ["Overall Verdict", verdict],
     ]
 
     overview_table = Table(
@@ -85,22 +129,12 @@ def build_pdf_report(
         hAlign="LEFT",
     )
 
-    verdict = summary["overall_verdict"]
-    overview_style = TableStyle(
-        [
-            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
-            ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FAFAFA")]),
-        ]
-    )
+    overview_style = TableStyle(_OVERVIEW_STYLE_BASE.getCommands())
 
     # Highlight verdict row
     verdict_row_index = len(overview_data) - 1
-    overview_style.add("TEXTCOLOR", (1, verdict_row_index), (1, verdict_row_index), _verdict_color(verdict))
+    vc = _verdict_color(verdict)
+    overview_style.add("TEXTCOLOR", (1, verdict_row_index), (1, verdict_row_index), vc)
     overview_style.add("FONTNAME", (1, verdict_row_index), (1, verdict_row_index), "Helvetica-Bold")
 
     overview_table.setStyle(overview_style)
@@ -124,17 +158,15 @@ def build_pdf_report(
     story.append(Spacer(1, 8))
 
     # Histogram
-    if Path(hist_path).exists():
-        story.append(Paragraph("Measurement Distribution", styles["Heading3"]))
-        story.append(Spacer(1, 6))
-        story.append(Image(hist_path, width=170 * mm, height=85 * mm))
-        story.append(Spacer(1, 10))
+    story.append(Paragraph("Measurement Distribution", styles["Heading3"]))
+    story.append(Spacer(1, 6))
+    story.append(Image(hist_buf, width=170 * mm, height=85 * mm))
+    story.append(Spacer(1, 10))
 
     # Scatter
-    if Path(scatter_path).exists():
-        story.append(Paragraph("Value vs Sample ID", styles["Heading3"]))
-        story.append(Spacer(1, 6))
-        story.append(Image(scatter_path, width=170 * mm, height=85 * mm))
+    story.append(Paragraph("Value vs Sample ID", styles["Heading3"]))
+    story.append(Spacer(1, 6))
+    story.append(Image(scatter_buf, width=170 * mm, height=85 * mm))
 
     story.append(PageBreak())
 
@@ -142,65 +174,47 @@ def build_pdf_report(
     story.append(Paragraph("Detailed Results", styles["Heading2"]))
     story.append(Spacer(1, 8))
 
-    # Build detailed table (limit row count for v1; later we’ll paginate)
-    # Keep it sane for now: first 200 rows
-    max_rows = 200
-    view_df = results_df.head(max_rows).copy()
+    # Build detailed table. ReportLab's Table layout grows quadratically with
+    # row count, so emit one Table per DETAIL_CHUNK rows and let them flow
+    # across pages; the total cost then stays linear.
+    view_df = results_df
 
     # Ensure unit exists
     if "unit" not in view_df.columns:
-        view_df["unit"] = ""
-
-    table_data = [["Sample", "Test", "Value", "Lower", "Upper", "Unit", "Status"]]
-    for _, r in view_df.iterrows():
-        table_data.append(
-            [
-                str(r["sample_id"]),
-                str(r["test_name"]),
-                f'{float(r["value"]):.6g}',
-                f'{float(r["lower_limit"]):.6g}',
-                f'{float(r["upper_limit"]):.6g}',
-                str(r["unit"]),
-                str(r["status"]),
-            ]
-        )
-
-    detail_table = Table(
-        table_data,
-        colWidths=[26 * mm, 35 * mm, 24 * mm, 24 * mm, 24 * mm, 18 * mm, 20 * mm],
-        repeatRows=1,
-        hAlign="LEFT",
-    )
-
-    detail_style = TableStyle(
-        [
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, 0), 9),
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F0F0F0")),
-            ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
-            ("FONTSIZE", (0, 1), (-1, -1), 8),
-            ("VALIGN", (0, 0), (-1,-1), "MIDDLE"),
-        ]
-    )
-
-    # Highlight FAIL rows
-    for i in range(1, len(table_data)):
-        status = table_data[i][-1]
-        if status == "FAIL":
-            detail_style.add("TEXTCOLOR", (-1, i), (-1, i), colors.red)
-            detail_style.add("FONTNAME", (-1, i), (-1, i), "Helvetica-Bold")
-
-    detail_table.setStyle(detail_style)
-    story.append(detail_table)
-
-    story.append(Spacer(1, 10))
-    if len(results_df) > max_rows:
-        story.append(
-            Paragraph(
-                f"Note: Showing first {max_rows} rows only. (We’ll add paging/export options later.)",
-                styles["Italic"],
-            )
+        view_df = view_df.assign(unit="")
+
+    header = ["Sample", "Test", "Value", "Lower", "Upper", "Unit", "Status"]
+    sid = _cell_strings(view_df["sample_id"])
+    tn = _cell_strings(view_df["test_name"])
+    vs = np.char.mod("%.6g", view_df["value"].to_numpy(dtype=float))
+    los = np.char.mod("%.6g", view_df["lower_limit"].to_numpy(dtype=float))
+    his = np.char.mod("%.6g", view_df["upper_limit"].to_numpy(dtype=float))
+    un = _cell_strings(view_df["unit"])
+    passed = view_df["pass"].to_numpy()
+    st = np.where(passed, "PASS", "FAIL")
+    rows = list(map(list, zip(sid, tn, vs, los, his, un, st)))
+
+    for start in range(0, len(rows), DETAIL_CHUNK):
+        stop = start + DETAIL_CHUNK
+        detail_table = Table(
+            [header] + rows[start:stop],
+            colWidths=[26 * mm, 35 * mm, 24 * mm, 24 * mm, 24 * mm, 18 * mm, 20 * mm],
+            repeatRows=1,
+            hAlign="LEFT",
         )
+        detail_table.setStyle(_DETAIL_STYLE)
+
+        # Highlight FAIL rows
+        fail_rows = (np.flatnonzero(~passed[start:stop]) + 1).tolist()
+        if fail_rows:
+            fail_style = TableStyle()
+            for i in fail_rows:
+                fail_style.add("TEXTCOLOR", (-1, i), (-1, i), colors.red)
+                fail_style.add("FONTNAME", (-1, i), (-1, i), "Helvetica-Bold")
+            detail_table.setStyle(fail_style)
+
+        story.append(detail_table)
+        story.append(Spacer(1, 4))
 
     # Footer note
     story.append(Spacer(1, 12))
@@ -1,22 +1,68 @@
 import pandas as pd
 
-REQUIRED_COLUMNS = {
+REQUIRED_COLUMNS = frozenset({
     "sample_id",
     "test_name",
     "value",
     "lower_limit",
     "upper_limit"
+})
+
+NUMERIC_COLUMNS = ("value", "lower_limit", "upper_limit")
+
+# Label columns repeat heavily; category codes are far cheaper than one
+# string per row.
+CATEGORICAL_COLUMNS = ("test_name", "unit", "sample_id")
+
+# Only the label columns are pinned at parse time. Numeric columns are cast
+# after the required-column check so errors come out in the same order
+# (and with the same per-column wording) as before.
+CSV_DTYPES = {
+    "sample_id": "string",
+    "test_name": "string",
+    "unit": "string",
 }
 
 def validate_csv(path):
-    df = pd.read_csv(path)
+    # pyarrow infers the remaining column types while parsing; pandas then
+    # applies CSV_DTYPES to the label columns.
+    try:
+        df = pd.read_csv(
+            path,
+            engine="pyarrow",
+            dtype_backend="pyarrow",
+            dtype=CSV_DTYPES,
+        )
+    except pd.errors.ParserError:
+        # pyarrow rejects ragged rows (e.g. a trailing optional unit left
+        # off); the C engine pads them with NaN as it always has.
+        df = pd.read_csv(path, dtype=CSV_DTYPES)
 
-    missing = REQUIRED_COLUMNS - set(df.columns)
+    missing = REQUIRED_COLUMNS.difference(df.columns)
     if missing:
-        raise ValueError(f"Missing required columns: {missing}")
+        raise ValueError(f"Missing required columns: {set(missing)}")
 
-    for col in ["value", "lower_limit", "upper_limit"]:
-        if not pd.api.types.is_numeric_dtype(df[col]):
+    # The pyarrow engine keeps repeated headers as-is (no "value.1"), which
+    # would make df[col] ambiguous below.
+    duplicated = df.columns[df.columns.duplicated()].unique()
+    if len(duplicated):
+        raise ValueError(f"Duplicate columns: {set(duplicated)}")
+
+    # A dtype.kind compare rejects non-numeric columns before any cast.
+    # Bools count as numeric (as is_numeric_dtype did), and pyarrow types an
+    # all-blank column as null rather than float (a header-only file is still
+    # rejected, as before).
+    dtypes = df.dtypes
+    for col in NUMERIC_COLUMNS:
+        all_blank = len(df) > 0 and df[col].isna().all()
+        if dtypes[col].kind not in "biuf" and not all_blank:
             raise ValueError(f"Column '{col}' must be numeric")
+        # Plain float64 gives downstream code contiguous NumPy arrays (NaN
+        # for blanks) rather than nullable Arrow-backed columns.
+        df[col] = df[col].astype("float64")
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
 
     return df
@@ -1,41 +1,109 @@
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
 import uuid
 import time
 
+from anyio import CapacityLimiter, to_thread
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import FileResponse, HTMLResponse
 
 from pdf_report import build_pdf_report
 
+logger = logging.getLogger(__name__)
+
 APP_DIR = Path(__file__).parent
 RUNS_DIR = APP_DIR / "runs"
 RUNS_DIR.mkdir(exist_ok=True)
+# Finished reports keyed by a hash of the upload + report options.
+CACHE_DIR = RUNS_DIR / "cache"
+CACHE_DIR.mkdir(exist_ok=True)
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+UPLOAD_CHUNK = 1 << 18  # 256 KiB
+WRITE_BUFFER = 1 << 20  # 1 MiB
+CLEANUP_INTERVAL_SECONDS = 10 * 60
+
+# Caps concurrent report builds without touching anyio's default limiter,
+# which sync routes and UploadFile reads share.
+_BUILD_LIMITER = CapacityLimiter((os.cpu_count() or 1) * 2)
+
+# The template is constant, so write it once at startup.
+TEMPLATE_PATH = APP_DIR / "template.csv"
+TEMPLATE_PATH.write_bytes(
+    b"sample_id,test_name,value,lower_limit,upper_limit,unit\n"
+    b"DUT_001,Output Power,-12.4,-15,-10,dBm\n"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Expired runs are swept in the background rather than on /generate.
+    cleanup_task = asyncio.create_task(periodic_cleanup())
+    yield
+    cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+
 
-app = FastAPI(title="CSV to Test Report")
+app = FastAPI(title="CSV to Test Report", lifespan=lifespan)
 
 
 # -------------------------
 # Helpers
 # -------------------------
 
-def cleanup_runs(older_than_hours: int = 6):
-    cutoff = time.time() - older_than_hours * 3600
-    for p in RUNS_DIR.iterdir():
+def _remove_older_than(parent: Path, cutoff: float, skip: Path | None = None):
+    try:
+        entries = list(parent.iterdir())
+    except OSError:  # e.g. runs/cache removed by hand; nothing to sweep
+        return
+    for p in entries:
         try:
-            if p.is_dir() and p.stat().st_mtime < cutoff:
-                for f in p.rglob("*"):
-                    if f.is_file():
-                        f.unlink()
-                p.rmdir()
-        except Exception:
+            if p != skip and p.is_dir() and p.stat().st_mtime < cutoff:
+                shutil.rmtree(p, ignore_errors=True)
+        except OSError:
             pass
 
 
+def cleanup_runs(older_than_hours: int = 6, cache_older_than_hours: int = 24):
+    now = time.time()
+    _remove_older_than(RUNS_DIR, now - older_than_hours * 3600, skip=CACHE_DIR)
+    _remove_older_than(CACHE_DIR, now - cache_older_than_hours * 3600)
+
+
+def cache_report(pdf_path: Path, cached_pdf: Path):
+    # Best-effort: a filesystem without hard links (EPERM/EXDEV) or an entry
+    # that already exists just means this report isn't cached.
+    try:
+        cached_pdf.parent.mkdir(parents=True, exist_ok=True)
+        os.link(pdf_path, cached_pdf)
+    except OSError:
+        pass
+
+
+async def periodic_cleanup(interval_seconds: int = CLEANUP_INTERVAL_SECONDS):
+    while True:
+        # One bad sweep must not switch off expiry for the rest of the process.
+        try:
+            await to_thread.run_sync(cleanup_runs)
+        except Exception:
+            logger.exception("Cleanup of expired runs failed")
+        await asyncio.sleep(interval_seconds)
+
+
 def friendly_error(e: Exception) -> str:
     s = str(e)
     if "Missing required columns" in s:
         return s + " Please use the template CSV."
+    if "Duplicate columns" in s:
+        return s + " Each column header must appear only once."
     if "must be numeric" in s:
         return s + " Ensure value and limits are numeric."
     return s
@@ -138,14 +206,8 @@ def home():
 
 @app.get("/template")
 def template_csv():
-    template_path = APP_DIR / "template.csv"
-    if not template_path.exists():
-        template_path.write_text(
-            "sample_id,test_name,value,lower_limit,upper_limit,unit\n"
-            "DUT_001,Output Power,-12.4,-15,-10,dBm\n"
-        )
     return FileResponse(
-        path=str(template_path),
+        path=str(TEMPLATE_PATH),
         media_type="text/csv",
         filename="template.csv",
     )
@@ -157,32 +219,63 @@ async def generate(
     report_title: str = Form("Automated Test Report"),
     company_name: str = Form(""),
 ):
-    cleanup_runs()
-
     if not file.filename.lower().endswith(".csv"):
         return HTMLResponse(html_page("Please upload a .csv file."), status_code=400)
 
-    content = await file.read()
-    if len(content) > 5 * 1024 * 1024:
-        return HTMLResponse(html_page("File too large (max 5MB)."), status_code=400)
-
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:8]
     run_dir = RUNS_DIR / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
 
     csv_path = run_dir / "input.csv"
     pdf_path = run_dir / "report.pdf"
-    csv_path.write_bytes(content)
 
+    title = report_title.strip() or "Automated Test Report"
+    company = company_name.strip() or None
+
+    # The cache key covers everything that shapes the PDF: the options and
+    # the uploaded bytes (hashed as they stream in).
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{title}\0{company or ''}\0".encode())
+
+    # Copy the upload to input.csv in chunks rather than reading it into
+    # memory at once. Starlette has already spooled the whole multipart body
+    # by now, so the size check only stops the copy early; it does not stop
+    # the upload from being received.
+    size = 0
+    too_large = False
+    with open(csv_path, "wb", buffering=WRITE_BUFFER) as out:
+        while chunk := await file.read(UPLOAD_CHUNK):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                too_large = True
+                break
+            hasher.update(chunk)
+            out.write(chunk)
+
+    if too_large:
+        csv_path.unlink()
+        run_dir.rmdir()
+        return HTMLResponse(html_page("File too large (max 5MB)."), status_code=400)
+
+    cached_pdf = CACHE_DIR / hasher.hexdigest() / "report.pdf"
     try:
-        build_pdf_report(
-            csv_path=str(csv_path),
-            out_pdf_path=str(pdf_path),
-            report_title=report_title.strip() or "Automated Test Report",
-            company_name=company_name.strip() or None,
-        )
-    except Exception as e:
-        return HTMLResponse(html_page("Error: " + friendly_error(e)), status_code=400)
+        os.link(cached_pdf, pdf_path)
+    except OSError:  # not cached, expired, or hard links unsupported
+        try:
+            # Blocking CSV -> PDF work; keep it off the event loop.
+            await to_thread.run_sync(
+                partial(
+                    build_pdf_report,
+                    csv_path=str(csv_path),
+                    out_pdf_path=str(pdf_path),
+                    report_title=title,
+                    company_name=company,
+                ),
+                limiter=_BUILD_LIMITER,
+            )
+        except Exception as e:
+            return HTMLResponse(html_page("Error: " + friendly_error(e)), status_code=400)
+        cache_report(pdf_path, cached_pdf)
 
     return HTMLResponse(
         f"""
@@ -199,10 +292,13 @@ async def generate(
 @app.get("/download/{run_id}")
 def download(run_id: str):
     pdf_path = RUNS_DIR / run_id / "report.pdf"
-    if not pdf_path.exists():
+    try:
+        stat_result = os.stat(pdf_path)
+    except FileNotFoundError:
         return HTMLResponse(html_page("Report not found or expired."))
     return FileResponse(
         path=str(pdf_path),
         media_type="application/pdf",
         filename="test-report.pdf",
+        stat_result=stat_result,
     )